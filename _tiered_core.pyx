@@ -0,0 +1,27 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""AOT-compiled scalar tier walk for tiered_tariff_calculator.
+
+Mirrors the pure-Python _tiered_scalar kernel: blocks/rates are the prepared
+contiguous float64 arrays with np.inf marking an unlimited block. Build in
+place with:
+
+    python setup.py build_ext --inplace
+
+tiered_tariff_calculator falls back to numba / generated Python code when this
+extension is not built.
+"""
+
+
+cpdef (double, double) tiered_scalar(double consumption, double[::1] blocks, double[::1] rates):
+    """Return (energy_cost, remaining) for one consumption value."""
+    cdef double remaining = consumption
+    cdef double energy = 0.0
+    cdef double block
+    cdef Py_ssize_t i
+    for i in range(blocks.shape[0]):
+        if remaining <= 0.0:
+            break
+        block = remaining if remaining < blocks[i] else blocks[i]
+        energy += block * rates[i]
+        remaining -= block
+    return energy, remaining
@@ -0,0 +1,13 @@
+"""Build script for the optional Cython billing kernel.
+
+    python setup.py build_ext --inplace
+
+Everything keeps working without the extension; see _tiered_core.pyx.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="tiered-tariff-core",
+    ext_modules=cythonize("_tiered_core.pyx", language_level=3),
+)
@@ -5,6 +5,8 @@ import pytest
 
 from tiered_tariff_calculator import (
     calculate_tiered_bill,
+    calculate_tiered_bills,
+    compile_tariff,
     parse_tiers,
     format_breakdown,
     format_currency,
@@ -31,6 +33,41 @@ def test_zero_consumption_short_circuit():
     assert r["energy_cost"] == 0.0
     assert r["total"] == 5.0
 
+def test_include_breakdown_false_fast_path():
+    tiers = [(100, 0.20), (None, 0.30)]
+    r = calculate_tiered_bill(150, tiers, fixed_fee=5.0, include_breakdown=False)
+    # totals identical to the default path, breakdown skipped
+    assert r["breakdown"] == []
+    assert pytest.approx(r["energy_cost"], rel=0, abs=1e-12) == 100 * 0.20 + 50 * 0.30
+    assert pytest.approx(r["total"], rel=0, abs=1e-12) == r["energy_cost"] + 5.0
+
+def test_batched_bills_match_scalar_api():
+    tiers = [(100, 0.20), (200, 0.30), (None, 0.40)]
+    consumptions = [0, 50, 100, 350, 1000]
+    r = calculate_tiered_bills(consumptions, tiers, fixed_fee=10)
+    for c, energy, total in zip(consumptions, r["energy_cost"], r["totals"]):
+        scalar = calculate_tiered_bill(c, tiers, fixed_fee=10)
+        assert pytest.approx(energy, rel=0, abs=1e-9) == scalar["energy_cost"]
+        assert pytest.approx(total, rel=0, abs=1e-9) == scalar["total"]
+
+def test_tier_list_of_lists_accepted():
+    # JSON-decoded tariffs are lists of lists, not tuples
+    tiers = json.loads(json.dumps([[100, 0.2], [None, 0.3]]))
+    r = calculate_tiered_bill(150, tiers, fixed_fee=0)
+    assert pytest.approx(r["energy_cost"], rel=0, abs=1e-12) == 100 * 0.2 + 50 * 0.3
+
+def test_compiled_tariff_accepted_by_both_apis():
+    tiers = [(100, 0.20), (200, 0.30), (None, 0.40)]
+    tariff = compile_tariff(tiers)
+    r = calculate_tiered_bill(350, tariff, fixed_fee=10)
+    assert pytest.approx(r["total"], rel=0, abs=1e-12) == 110.0
+    rb = calculate_tiered_bills([350], tariff, fixed_fee=10)
+    assert pytest.approx(rb["totals"][0], rel=0, abs=1e-9) == 110.0
+
+def test_batched_bills_overflow_raises():
+    with pytest.raises(ValueError, match=r"Consumption exceeds defined tiers by"):
+        calculate_tiered_bills([50, 101], [(100, 0.2)], 0)
+
 def test_parse_tiers_json_and_shorthand_and_currency():
     # JSON path
     js = json.dumps([[100, 0.2], [None, 0.3]])
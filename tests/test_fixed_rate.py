@@ -89,3 +89,18 @@ def test_main_runs_without_error(monkeypatch, capsys):
     out = capsys.readouterr().out
     assert "Total electricity consumption" in out
     assert "Bill Amount" in out
+
+
+# ================================
+# E. pandas 兜底路径测试（无 polars/pyarrow 时的分块求和）
+# ================================
+
+def test_pandas_fallback_chunked_sum(tmp_path, monkeypatch):
+    import fixed_rate
+
+    csv = tmp_path / "usage.csv"
+    csv.write_text("date,kWh\n2024-01-01,1.5\n2024-01-02,2.5\n")
+    # 强制走 pandas 兜底（pd.read_csv 未被替换，仍是真实函数）
+    monkeypatch.setattr("fixed_rate._HAVE_POLARS", False)
+    monkeypatch.setattr("fixed_rate._HAVE_PYARROW", False)
+    assert fixed_rate._total_usage_from_csv(str(csv)) == 4.0
@@ -13,142 +13,334 @@ Where None means an unlimited final block.
 """
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict, Any
-import json
+from functools import lru_cache
+import math
+from typing import List, Optional, Tuple, Dict, Any, Union
+import re
+
+try:  # optional: SIMD JSON parser, same objects out
+    import orjson as _json
+except ImportError:  # pragma: no cover
+    import json as _json
+
+import numpy as np
+
+try:  # optional: AOT-compiled kernel, built via `python setup.py build_ext --inplace`
+    from _tiered_core import tiered_scalar as _tiered_scalar_c
+except ImportError:  # pragma: no cover
+    _tiered_scalar_c = None
+
+try:  # optional: JIT the scalar kernel; pure-Python fallback below
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
 
 __all__ = [
     "calculate_tiered_bill",
+    "calculate_tiered_bills",
+    "compile_tariff",
     "parse_tiers",
     "format_breakdown",
 ]
 
+TierList = List[Tuple[Optional[float], float]]
+
+
 # -----------------------------
 # Data structures
 # -----------------------------
-@dataclass
-class TierBreakdown:
-    tier_index: int
-    kwh: float
-    rate: float
-    cost: float
-
-    def as_dict(self) -> Dict[str, Any]:
-        return {"tier": self.tier_index, "kwh": self.kwh, "rate": self.rate, "cost": self.cost}
-
+@dataclass(frozen=True, eq=False)
+class _Tariff:
+    """Struct-of-arrays view of a tariff: contiguous block/rate arrays instead
+    of a list of scattered tuples. np.inf marks an unlimited block."""
+    blocks: np.ndarray
+    rates: np.ndarray
+    has_unlimited: bool
+    key: Tuple[Tuple[Optional[float], float], ...]
 
 # -----------------------------
 # Validation helpers
 # -----------------------------
 
-def _validate_common(consumption_kwh: float, fixed_fee: float) -> None:
-    if consumption_kwh < 0:
-        raise ValueError("consumption_kwh must be >= 0")
-    if fixed_fee < 0:
-        raise ValueError("fixed_fee must be >= 0")
+@lru_cache(maxsize=256)
+def _prepare_tiers(tier_key: Tuple[Tuple[Optional[float], float], ...]) -> _Tariff:
+    """Convert a (hashable) tier tuple to a validated SoA _Tariff.
 
-
-def _validate_tier_list(tier_list: List[Tuple[Optional[float], float]]) -> None:
-    if not tier_list:
+    Unlimited blocks (None) become np.inf so the vectorized kernel needs no
+    None-checks. Validation runs as fused array comparisons, with the first
+    offending index recovered via argmax to keep the original error messages.
+    Cached per unique tariff so repeated billing pays conversion and
+    validation only once.
+    """
+    if not tier_key:
         raise ValueError("tiers must be a non-empty list")
-    for i, (block_kwh, rate) in enumerate(tier_list, start=1):
-        if rate < 0:
-            raise ValueError(f"rate for tier {i} must be >= 0")
-        if block_kwh is not None and block_kwh <= 0:
-            raise ValueError(f"block_kwh for tier {i} must be > 0 or None for unlimited")
+    blocks = np.array([np.inf if b is None else float(b) for b, _ in tier_key], dtype=np.float64)
+    rates = np.array([float(r) for _, r in tier_key], dtype=np.float64)
+    bad_rates = rates < 0
+    if bad_rates.any():
+        raise ValueError(f"rate for tier {int(np.argmax(bad_rates)) + 1} must be >= 0")
+    bad_blocks = ~(blocks > 0)  # np.inf (unlimited) passes; 0, negatives and NaN do not
+    if bad_blocks.any():
+        raise ValueError(f"block_kwh for tier {int(np.argmax(bad_blocks)) + 1} must be > 0 or None for unlimited")
     # Removed: allow all finite tiers; overflow handled after computation
+    return _Tariff(blocks=blocks, rates=rates, has_unlimited=bool(np.isinf(blocks).any()), key=tier_key)
+
+
+def _tier_key(tier_list: TierList) -> Tuple[Tuple[Optional[float], float], ...]:
+    # Convert inner pairs too: JSON-decoded tariffs arrive as lists of lists,
+    # which are unhashable and would blow up inside lru_cache.
+    return tuple((b, r) for b, r in tier_list)
+
+
+def compile_tariff(tier_list: TierList) -> _Tariff:
+    """Pre-convert a tier list for hot callers; the result can be passed to
+    calculate_tiered_bill / calculate_tiered_bills in place of the list."""
+    return _prepare_tiers(_tier_key(tier_list))
+
+
+def _as_tariff(tier_list: Union[TierList, _Tariff]) -> _Tariff:
+    if isinstance(tier_list, _Tariff):
+        return tier_list
+    return _prepare_tiers(_tier_key(tier_list))
+
+
+def _tiered_scalar(consumption: float, blocks: np.ndarray, rates: np.ndarray) -> Tuple[float, float]:
+    """Scalar tier walk over prepared arrays; returns (energy_cost, remaining).
+
+    Kept free of Python objects so numba can compile it; unlimited tiers are
+    np.inf entries in blocks.
+    """
+    remaining = consumption
+    energy = 0.0
+    for i in range(blocks.shape[0]):
+        if remaining <= 0.0:
+            break
+        # Conditional select instead of min(): no builtin call per iteration
+        # (stdlib math has no fmin), and it compiles to a plain cmp under
+        # numba/Cython. Both operands are non-NaN floats, so semantics match.
+        block = remaining if remaining < blocks[i] else blocks[i]
+        energy += block * rates[i]
+        remaining -= block
+    return energy, remaining
+
+
+if njit is not None:
+    _tiered_scalar = njit(cache=True)(_tiered_scalar)
+
+
+@lru_cache(maxsize=256)
+def _compile_tiered(tier_key: Tuple[Tuple[Optional[float], float], ...]):
+    """Generate a straight-line totals-only function specialized to one tariff.
+
+    Tier sizes and rates are baked in as literals, so the compiled function has
+    no loop, no tuple unpacking and no None checks — just min/subtract per
+    tier. Returns a callable f(consumption) -> (energy_cost, remaining),
+    matching the _tiered_scalar contract. Cached per tariff.
+    """
+    src = ["def _specialized(c):", "    e = 0.0"]
+    for block, rate in tier_key:
+        r = float(rate)
+        if block is None:
+            src.append(f"    e += c * {r!r}")
+            src.append("    c = 0.0")
+        else:
+            b = float(block)
+            src.append(f"    k = c if c < {b!r} else {b!r}")
+            src.append(f"    e += k * {r!r}")
+            src.append("    c -= k")
+    src.append("    return e, c")
+    ns: Dict[str, Any] = {}
+    exec("\n".join(src), ns)
+    return ns["_specialized"]
+
+
 # -----------------------------
 # Core computation
 # -----------------------------
 
 def calculate_tiered_bill(
     consumption_kwh: float,
-    tier_list: List[Tuple[Optional[float], float]],
+    tier_list: Union[TierList, _Tariff],
     fixed_fee: float = 0.0,
+    include_breakdown: bool = True,
 ) -> Dict[str, Any]:
     """Compute a progressive tiered electricity bill.
 
     Args:
         consumption_kwh: Total consumption in kWh for the billing period.
-        tier_list: List of (block_kwh, rate). Use None for the last tier to denote unlimited remainder.
+        tier_list: List of (block_kwh, rate), with None denoting an unlimited
+            final block, or a pre-compiled tariff from compile_tariff().
         fixed_fee: Fixed supply charge for the billing period.
+        include_breakdown: Skip per-tier dict assembly when False (fast path for
+            callers that only need the totals).
 
     Returns:
         dict with keys: breakdown (list of dict), energy_cost, fixed_fee, total
     """
-    _validate_common(consumption_kwh, fixed_fee)
-    _validate_tier_list(tier_list)
+    # Single branch on the happy path; pick the message only when raising.
+    if consumption_kwh < 0 or fixed_fee < 0:
+        raise ValueError(
+            "consumption_kwh must be >= 0" if consumption_kwh < 0 else "fixed_fee must be >= 0"
+        )
 
-    remaining = float(consumption_kwh)
-    breakdown: List[TierBreakdown] = []
+    consumption = float(consumption_kwh)
+    tariff = _as_tariff(tier_list)
+    blocks, rates = tariff.blocks, tariff.rates
 
-    for idx, (block_kwh, rate) in enumerate(tier_list, start=1):
-        if remaining <= 0:
-            break
-        block = remaining if block_kwh is None else min(remaining, float(block_kwh))
-        cost = block * rate
-        breakdown.append(TierBreakdown(tier_index=idx, kwh=block, rate=rate, cost=cost))
-        remaining -= block
+    if not include_breakdown:
+        # Totals-only fast path: prefer the AOT Cython kernel (no JIT warmup),
+        # then the numba-compiled kernel, then a runtime-specialized
+        # straight-line function per tariff.
+        if _tiered_scalar_c is not None:
+            energy_cost, remaining = _tiered_scalar_c(consumption, blocks, rates)
+        elif njit is not None:
+            energy_cost, remaining = _tiered_scalar(consumption, blocks, rates)
+        else:
+            energy_cost, remaining = _compile_tiered(tariff.key)(consumption)
+        if remaining > 1e-9:
+            raise ValueError(
+                f"Consumption exceeds defined tiers by {remaining:.3f} kWh. Add a final tier with block_kwh=None."
+            )
+        return {
+            "breakdown": [],
+            "energy_cost": energy_cost,
+            "fixed_fee": fixed_fee,
+            "total": energy_cost + fixed_fee,
+        }
 
+    # kWh consumed in each tier: clamp (consumption - kWh covered by earlier
+    # tiers) into [0, block]. Vectorized over all tiers at once.
+    prev_cum = np.concatenate(([0.0], np.cumsum(blocks)[:-1]))
+    caps = np.minimum(blocks, np.maximum(0.0, consumption - prev_cum))
+
+    remaining = consumption - caps.sum()
     if remaining > 1e-9:
         raise ValueError(
             f"Consumption exceeds defined tiers by {remaining:.3f} kWh. Add a final tier with block_kwh=None."
         )
 
-    energy_cost = sum(t.cost for t in breakdown)
+    # Compensated sum over the exact per-tier costs, so energy_cost always
+    # equals the sum of the entries shown in the breakdown. The totals-only
+    # path above keeps the straight accumulator; the batched path relies on
+    # NumPy's pairwise @ reduction.
+    costs = caps * rates
+    energy_cost = math.fsum(costs)
     total = energy_cost + fixed_fee
 
+    # Plain dict literals: no intermediate dataclass + as_dict round-trip.
+    breakdown = [
+        {"tier": int(idx) + 1, "kwh": float(caps[idx]), "rate": float(rates[idx]), "cost": float(costs[idx])}
+        for idx in np.flatnonzero(caps > 0)
+    ]
+
     return {
-        "breakdown": [t.as_dict() for t in breakdown],
+        "breakdown": breakdown,
         "energy_cost": energy_cost,
         "fixed_fee": fixed_fee,
         "total": total,
     }
 
 
+def calculate_tiered_bills(
+    consumptions: np.ndarray,
+    tier_list: Union[TierList, _Tariff],
+    fixed_fee: float = 0.0,
+) -> Dict[str, np.ndarray]:
+    """Compute tiered bills for a whole vector of consumptions at once.
+
+    Broadcasting the (N,) consumption vector against the cumulative tier
+    caps yields an (N, T) per-tier-kWh matrix; a single matrix-vector
+    product against the rates gives all energy costs. No per-customer
+    Python loop and no breakdown assembly.
+
+    Args:
+        consumptions: 1-D array-like of consumptions in kWh, all >= 0.
+        tier_list: Same format as calculate_tiered_bill.
+        fixed_fee: Fixed supply charge applied to every bill.
+
+    Returns:
+        dict with keys: energy_cost (N,) and totals (N,) float64 arrays.
+    """
+    if fixed_fee < 0:
+        raise ValueError("fixed_fee must be >= 0")
+
+    cons = np.asarray(consumptions, dtype=np.float64)
+    if cons.ndim != 1:
+        raise ValueError("consumptions must be a 1-D array")
+    if (cons < 0).any():
+        raise ValueError("consumption_kwh must be >= 0")
+
+    tariff = _as_tariff(tier_list)
+    blocks, rates = tariff.blocks, tariff.rates
+    cum = np.concatenate(([0.0], np.cumsum(blocks)))
+    per_tier = np.clip(cons[:, None] - cum[None, :-1], 0.0, blocks[None, :])
+
+    remaining = cons - per_tier.sum(axis=1)
+    overflow = remaining > 1e-9
+    if overflow.any():
+        worst = float(remaining[overflow].max())
+        raise ValueError(
+            f"Consumption exceeds defined tiers by {worst:.3f} kWh. Add a final tier with block_kwh=None."
+        )
+
+    energy_cost = per_tier @ rates
+    return {"energy_cost": energy_cost, "totals": energy_cost + fixed_fee}
+
+
 # -----------------------------
 # Parsing and presentation helpers
 # -----------------------------
 
-def parse_tiers(text: str) -> List[Tuple[Optional[float], float]]:
-    """Parse tiers from JSON or shorthand string."""
-    if not text:
-        raise ValueError("tiers text is empty")
+# One compiled pattern tokenizes a whole "size@rate, size@rate, ..." string;
+# the unlimited markers are handled after matching.
+_TIER_RE = re.compile(r"\s*([^,@]+?)\s*@\s*([^,]+?)\s*(?:,|$)")
+_UNLIMITED_MARKERS = frozenset({"*", "None", "null"})
+
+
+@lru_cache(maxsize=256)
+def _parse_tiers_cached(text: str) -> Tuple[Tuple[Optional[float], float], ...]:
     t = text.strip()
     if t.startswith("["):
-        data = json.loads(t)
-        out: List[Tuple[Optional[float], float]] = []
-        for pair in data:
-            size, rate = pair
-            out.append((None if size is None else float(size), float(rate)))
-        return out
+        data = _json.loads(t)
+        return tuple((None if size is None else float(size), float(rate)) for size, rate in data)
     # shorthand
-    out: List[Tuple[Optional[float], float]] = []
-    for part in t.split(','):
-        size_s, rate_s = part.strip().split('@')
-        size = None if size_s.strip() in {"*", "None", "null"} else float(size_s)
-        out.append((size, float(rate_s)))
-    return out
+    pairs = _TIER_RE.findall(t)
+    if len(pairs) != t.count(',') + 1:
+        raise ValueError(f"invalid tiers shorthand: {text!r}")
+    return tuple(
+        (None if size_s in _UNLIMITED_MARKERS else float(size_s), float(rate_s))
+        for size_s, rate_s in pairs
+    )
+
+
+def parse_tiers(text: str) -> List[Tuple[Optional[float], float]]:
+    """Parse tiers from JSON or shorthand string. Results are memoized per input string."""
+    if not text:
+        raise ValueError("tiers text is empty")
+    # Return a fresh list so callers can mutate without poisoning the cache.
+    return list(_parse_tiers_cached(text))
 
 
+@lru_cache(maxsize=4096)
 def format_currency(value: float, symbol: str = "$") -> str:
+    # Common amounts and rates repeat heavily across invoices; a cache hit
+    # skips the grouped-float formatting entirely.
     return f"{symbol}{value:,.2f}"
 
 
 def format_breakdown(result: Dict[str, Any], currency_symbol: str = "$") -> str:
+    sym = currency_symbol
     lines = ["Breakdown:"]
     for item in result.get("breakdown", []):
-        tier = item.get("tier", "-")
-        kwh = float(item.get("kwh", 0.0))
-        rate = float(item.get("rate", 0.0))
-        cost = float(item.get("cost", kwh * rate))
-        lines.append(
-            f"  Tier {tier}: {kwh:.3f} kWh × {format_currency(rate, currency_symbol)} = {format_currency(cost, currency_symbol)}"
-        )
+        kwh = item.get("kwh", 0.0)
+        rate = item.get("rate", 0.0)
+        cost = item.get("cost", kwh * rate)
+        lines.append(f"  Tier {item.get('tier', '-')}: {kwh:.3f} kWh × {sym}{rate:,.2f} = {sym}{cost:,.2f}")
     lines.append("")
-    lines.append(f"Energy cost = {format_currency(float(result.get('energy_cost', 0.0)), currency_symbol)}")
-    lines.append(f"Fixed fee   = {format_currency(float(result.get('fixed_fee', 0.0)), currency_symbol)}")
-    lines.append(f"Total bill  = {format_currency(float(result.get('total', 0.0)), currency_symbol)}")
-    return "/n".join(lines)
+    lines.append(f"Energy cost = {format_currency(result.get('energy_cost', 0.0), sym)}")
+    lines.append(f"Fixed fee   = {format_currency(result.get('fixed_fee', 0.0), sym)}")
+    lines.append(f"Total bill  = {format_currency(result.get('total', 0.0), sym)}")
+    return "\n".join(lines)
 
 
 # -----------------------------